@@ -10,15 +10,19 @@ Hand Gesture Emoji Display
 Usage:
     python main.py
     python main.py --camera 1   # מצלמה אחרת
+    python main.py --model path/to/custom.task
 """
 
 import sys
 import time
+
 import cv2
+import numpy as np
 
 from src.camera import Camera
-from src.gesture.detector import HandDetector
-from src.gesture.recognizer import GestureRecognizer
+from src.gesture.detector import DEFAULT_MODEL, HandDetector
+from src.gesture.recognizer import GESTURE_IDS, GestureRecognizer
+from src.pipeline import PipelineThread
 from src.ui.visualizer import Visualizer
 
 GESTURE_EMOJI = {
@@ -33,39 +37,43 @@ def main():
     import argparse
     p = argparse.ArgumentParser()
     p.add_argument("--camera", type=int, default=0)
+    p.add_argument("--model", default=DEFAULT_MODEL,
+                   help="float16 (ברירת מחדל) או נתיב לקובץ .task")
     args = p.parse_args()
 
     camera     = Camera(index=args.camera)
-    detector   = HandDetector(max_hands=2, detection_confidence=0.7)
+    detector   = HandDetector(max_hands=2, detection_confidence=0.7,
+                              model=args.model)
     recognizer = GestureRecognizer()
     visualizer = Visualizer()
 
-    last_trigger: dict[str, float] = {}
+    # time.monotonic() של הטריגר האחרון, לפי GESTURE_IDS
+    last_trigger = np.full(len(GESTURE_IDS), -np.inf)
+
+    def on_gestures(gestures):
+        for gesture in gestures:
+            emoji = GESTURE_EMOJI.get(gesture.name)
+            if not emoji:
+                continue
+            gid = GESTURE_IDS[gesture.name]
+            now = time.monotonic()
+            if now - last_trigger[gid] >= COOLDOWN:
+                visualizer.show_emoji(emoji)
+                last_trigger[gid] = now
 
     if not camera.open():
         print("שגיאה: לא הצלחתי לפתוח את המצלמה")
         sys.exit(1)
 
-    try:
-        while True:
-            frame = camera.read()
-            if frame is None:
-                continue
-
-            detection = detector.detect(frame)
-            gestures  = recognizer.recognize(detection)
+    pipeline = PipelineThread(camera, detector, recognizer, visualizer, on_gestures)
+    pipeline.start()
 
-            for gesture in gestures:
-                emoji = GESTURE_EMOJI.get(gesture.name)
-                if not emoji:
-                    continue
-                now = time.time()
-                if now - last_trigger.get(gesture.name, 0.0) >= COOLDOWN:
-                    visualizer.show_emoji(emoji)
-                    last_trigger[gesture.name] = now
-
-            display = visualizer.draw(frame, detection, gestures)
-            cv2.imshow("Hand Gesture  [Q / ESC = יציאה]", display)
+    # החלון והמקלדת נשארים ב-thread הראשי
+    try:
+        while pipeline.is_alive():
+            display = pipeline.latest()
+            if display is not None:
+                cv2.imshow("Hand Gesture  [Q / ESC = יציאה]", display)
 
             key = cv2.waitKey(1) & 0xFF
             if key in (ord("q"), 27):
@@ -74,6 +82,7 @@ def main():
     except KeyboardInterrupt:
         pass
     finally:
+        pipeline.stop()
         camera.release()
         detector.close()
         cv2.destroyAllWindows()
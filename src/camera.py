@@ -1,10 +1,46 @@
 import cv2
 import logging
+import threading
+import time
 from typing import Optional
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# grab() שחוזר מהר מזה הגיע מהבאפר ולא מהחיישן
+_BUFFERED_GRAB_SECS = 0.002
+_MAX_DRAIN_GRABS = 8
+
+
+class CameraThread(threading.Thread):
+    """קורא פריימים ברקע ושומר רק את האחרון (slot יחיד, לא תור)."""
+
+    def __init__(self, camera: "Camera"):
+        super().__init__(name=f"camera-{camera.index}", daemon=True)
+        self._camera = camera
+        self._lock = threading.Lock()
+        self._latest: Optional[np.ndarray] = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            frame = self._camera._capture()
+            if frame is None:
+                time.sleep(0.005)
+                continue
+            with self._lock:
+                self._latest = frame
+
+    def take(self) -> Optional[np.ndarray]:
+        """מוציא את הפריים מה-slot: כל פריים נמסר פעם אחת בלבד, והקורא הבעלים שלו."""
+        with self._lock:
+            frame, self._latest = self._latest, None
+            return frame
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
+
 
 class Camera:
     def __init__(self, index: int = 0, width: int = 1280, height: int = 720):
@@ -12,6 +48,8 @@ class Camera:
         self.width = width
         self.height = height
         self._cap: Optional[cv2.VideoCapture] = None
+        self._drain = False
+        self._thread: Optional[CameraThread] = None
 
     def open(self) -> bool:
         self._cap = cv2.VideoCapture(self.index)
@@ -23,21 +61,52 @@ class Camera:
         self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
         self._cap.set(cv2.CAP_PROP_FPS, 30)
 
+        # Keep only the newest frame queued; some backends (MSMF/DSHOW) ignore this
+        buffered = self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        logger.info(f"Camera {self.index} CAP_PROP_BUFFERSIZE=1 -> {buffered}")
+        self._drain = not buffered
+
+        self._thread = CameraThread(self)
+        self._thread.start()
+
         logger.info(f"Camera {self.index} opened: {self.width}x{self.height}")
         return True
 
     def read(self) -> Optional[np.ndarray]:
+        # Never blocks: newest captured frame not yet read, or None until a new one arrives.
+        # Each frame is handed out once, so the caller may draw on it in place
+        if self._thread is None:
+            return None
+        return self._thread.take()
+
+    def _capture(self) -> Optional[np.ndarray]:
         if self._cap is None or not self._cap.isOpened():
             return None
 
-        ret, frame = self._cap.read()
+        if self._drain:
+            ret, frame = self._read_drained()
+        else:
+            ret, frame = self._cap.read()
         if not ret:
             return None
 
         # Flip horizontally for natural mirror effect
         return cv2.flip(frame, 1)
 
+    def _read_drained(self):
+        # Skip queued frames: keep grabbing until a grab actually waits for the sensor
+        for _ in range(_MAX_DRAIN_GRABS):
+            t0 = time.perf_counter()
+            if not self._cap.grab():
+                return False, None
+            if time.perf_counter() - t0 >= _BUFFERED_GRAB_SECS:
+                break
+        return self._cap.retrieve()
+
     def release(self):
+        if self._thread:
+            self._thread.stop()
+            self._thread = None
         if self._cap:
             self._cap.release()
             logger.info("Camera released")
@@ -1,21 +1,32 @@
+import logging
 import os
+import threading
 import time
 import urllib.request
 import cv2
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional, Tuple
 
 import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision as mp_vision
 
+logger = logging.getLogger(__name__)
+
 MODEL_PATH = "hand_landmarker.task"
 MODEL_URL  = (
     "https://storage.googleapis.com/mediapipe-models/"
     "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
 )
 
+# גרסאות מודל מוכרות: שם → (קובץ מקומי, URL להורדה).
+# כל ערך אחר של model מתפרש כנתיב לקובץ .task
+MODEL_VARIANTS = {
+    "float16": (MODEL_PATH, MODEL_URL),
+}
+DEFAULT_MODEL = "float16"
+
 # חיבורים בין נקודות היד (אינדקסים של MediaPipe)
 HAND_CONNECTIONS = [
     (0, 1), (1, 2), (2, 3), (3, 4),          # אגודל
@@ -26,9 +37,19 @@ HAND_CONNECTIONS = [
     (0, 17),                                   # כף יד
 ]
 
+# שער תנועה: אם הפריים כמעט לא השתנה, משתמשים שוב בתוצאה הקודמת
+MOTION_GATE_SIZE    = (160, 90)
+MOTION_GATE_THRESH  = 2.0     # ממוצע הפרש בהירות (0-255)
+MOTION_GATE_MAX_AGE = 0.2    # שניות
+
+# OpenCL (UMat) להקטנה ולהמרת צבע, אם זמין
+USE_OPENCL = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
 
 @dataclass
 class HandLandmarks:
+    __slots__ = ("landmarks", "handedness", "confidence")
+
     landmarks: list    # 21 NormalizedLandmark
     handedness: str    # 'Left' | 'Right'
     confidence: float
@@ -37,37 +58,95 @@ class HandLandmarks:
 @dataclass
 class DetectionResult:
     hands: List[HandLandmarks] = field(default_factory=list)
+    # timestamp של detect_async שממנו הגיעה התוצאה (None = לא מ-HandDetector).
+    # detect() מחזיר את אותה תוצאה שוב עד שמגיעה חדשה — כך אפשר לזהות חזרה
+    timestamp_ms: Optional[int] = None
+    # x, y מנורמלים של כל הידיים, (N_hands, 21, 2) float32. נבנה פעם אחת ב-_on_result
+    # (ב-thread של MediaPipe) ומשותף ל-recognizer ול-landmarks_px
+    landmarks_xy: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 21, 2), dtype=np.float32),
+        repr=False, compare=False)
+    # מטמון פנימי של landmarks_px — לא חלק מה-constructor ולא מ-__eq__
+    _px: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _px_size: Tuple[int, int] = field(default=(0, 0), init=False, repr=False, compare=False)
+
+    def landmarks_px(self, width: int, height: int) -> np.ndarray:
+        """כל ה-landmarks בפיקסלים, (N_hands, 21, 2) int32 — מחושב פעם אחת לכל גודל פריים."""
+        if self._px is None or self._px_size != (width, height):
+            self._px = np.multiply(self.landmarks_xy, (width, height)).astype(np.int32)
+            self._px_size = (width, height)
+        return self._px
+
+
+def _resolve_model(model: str) -> str:
+    """שם גרסה מ-MODEL_VARIANTS (מוריד אם צריך) או נתיב לקובץ .task."""
+    if model in MODEL_VARIANTS:
+        path, url = MODEL_VARIANTS[model]
+        if not os.path.exists(path):
+            print("מוריד מודל זיהוי יד (חד-פעמי, ~29MB)...")
+            urllib.request.urlretrieve(url, path)
+            print("הורדה הושלמה.")
+        return path
+    if not os.path.exists(model):
+        raise FileNotFoundError(f"Hand landmarker model not found: {model}")
+    return model
 
 
 class HandDetector:
 
     def __init__(self, max_hands: int = 2, detection_confidence: float = 0.7,
-                 tracking_confidence: float = 0.5):
-        if not os.path.exists(MODEL_PATH):
-            print("מוריד מודל זיהוי יד (חד-פעמי, ~29MB)...")
-            urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
-            print("הורדה הושלמה.")
+                 tracking_confidence: float = 0.5,
+                 infer_width: int = 640,
+                 model: str = DEFAULT_MODEL):
+        model_path = _resolve_model(model)
+
+        def make_options(delegate):
+            return mp_vision.HandLandmarkerOptions(
+                base_options=mp_python.BaseOptions(model_asset_path=model_path,
+                                                   delegate=delegate),
+                num_hands=max_hands,
+                min_hand_detection_confidence=detection_confidence,
+                min_hand_presence_confidence=0.5,
+                min_tracking_confidence=tracking_confidence,
+                running_mode=mp_vision.RunningMode.LIVE_STREAM,
+                result_callback=self._on_result,
+            )
+
+        # LIVE_STREAM: התוצאות מגיעות ב-callback מה-thread של MediaPipe
+        self._result_lock = threading.Lock()
+        self._latest      = DetectionResult()
+        self._last_ts_ms  = -1
+
+        # GPU אם אפשר (צריך EGL/GL), אחרת CPU
+        Delegate = mp_python.BaseOptions.Delegate
+        try:
+            self._landmarker = mp_vision.HandLandmarker.create_from_options(
+                make_options(Delegate.GPU))
+            logger.info("Hand landmarker delegate: GPU")
+        except Exception as e:
+            logger.info(f"GPU delegate unavailable ({e}), using CPU")
+            self._landmarker = mp_vision.HandLandmarker.create_from_options(
+                make_options(Delegate.CPU))
 
-        base_options = mp_python.BaseOptions(model_asset_path=MODEL_PATH)
-        options = mp_vision.HandLandmarkerOptions(
-            base_options=base_options,
-            num_hands=max_hands,
-            min_hand_detection_confidence=detection_confidence,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=tracking_confidence,
-            running_mode=mp_vision.RunningMode.VIDEO,
-        )
-        self._landmarker  = mp_vision.HandLandmarker.create_from_options(options)
         self._start_time  = time.perf_counter()
-
-    def detect(self, frame: np.ndarray) -> DetectionResult:
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image  = mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
-
-        timestamp_ms = int((time.perf_counter() - self._start_time) * 1000)
-        result = self._landmarker.detect_for_video(mp_image, timestamp_ms)
-
-        detection = DetectionResult()
+        # המודל רץ על 224x224 — אין טעם להעביר לו פריים מלא.
+        # ה-landmarks מנורמלים ל-[0,1] ולכן מתאימים גם לפריים המקורי
+        self._infer_width = infer_width
+        self._infer_size: Tuple[int, int] = (0, 0)
+        self._src_size:   Tuple[int, int] = (0, 0)
+        # באפרים קבועים להקטנה ול-RGB — מוקצים בפריים הראשון לפי הגודל שלו
+        self._small_bgr: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+        # אותו הדבר בצד ה-GPU כשיש OpenCL
+        self._small_u: Optional[cv2.UMat] = None
+        self._rgb_u:   Optional[cv2.UMat] = None
+
+        self._prev_small: Optional[np.ndarray] = None
+        self._last_detection: Optional[DetectionResult] = None
+        self._last_detection_time = 0.0
+
+    def _on_result(self, result, image, timestamp_ms: int):
+        detection = DetectionResult(timestamp_ms=timestamp_ms)
         if result.hand_landmarks and result.handedness:
             for landmarks, handedness in zip(result.hand_landmarks, result.handedness):
                 detection.hands.append(HandLandmarks(
@@ -75,7 +154,77 @@ class HandDetector:
                     handedness=handedness[0].category_name,   # 'Left' | 'Right'
                     confidence=handedness[0].score,
                 ))
+            detection.landmarks_xy = np.fromiter(
+                (c for hand in detection.hands for lm in hand.landmarks for c in (lm.x, lm.y)),
+                dtype=np.float32, count=len(detection.hands) * 42,
+            ).reshape(-1, 21, 2)
+        with self._result_lock:
+            self._latest = detection
+
+    def _scene_unchanged(self, frame: np.ndarray) -> bool:
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_GATE_SIZE,
+                           interpolation=cv2.INTER_AREA)
+        prev, self._prev_small = self._prev_small, small
+        if prev is None:
+            return False
+        return cv2.absdiff(small, prev).mean() < MOTION_GATE_THRESH
+
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """מקטין לרוחב infer_width (באותו יחס צדדים) וממיר ל-RGB."""
+        h, w = frame.shape[:2]
+        downscale = w > self._infer_width
+        if downscale and self._src_size != (w, h):
+            # יחס הצדדים של המצלמה נשמר — גם אם היא לא כיבדה את בקשת ה-720p
+            self._src_size   = (w, h)
+            self._infer_size = (self._infer_width, round(self._infer_width * h / w))
+            self._small_bgr  = np.empty((self._infer_size[1], self._infer_size[0], 3),
+                                        dtype=np.uint8)
+            if USE_OPENCL:
+                self._small_u = cv2.UMat(self._infer_size[1], self._infer_size[0], cv2.CV_8UC3)
+                self._rgb_u   = cv2.UMat(self._infer_size[1], self._infer_size[0], cv2.CV_8UC3)
+
+        if USE_OPENCL and downscale:
+            # הקטנה והמרה על ה-GPU לתוך באפרים קבועים; הורדה אחת של התמונה הקטנה.
+            # ל-UMat.get() אין פרמטר dst ב-Python, לכן ההורדה עצמה מקצה מערך
+            cv2.resize(cv2.UMat(frame), self._infer_size, dst=self._small_u,
+                       interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._small_u, cv2.COLOR_BGR2RGB, dst=self._rgb_u)
+            return self._rgb_u.get()
+
+        if downscale:
+            cv2.resize(frame, self._infer_size, dst=self._small_bgr,
+                       interpolation=cv2.INTER_AREA)
+            frame = self._small_bgr
+        if self._rgb is None or self._rgb.shape != frame.shape:
+            self._rgb = np.empty(frame.shape, dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
 
+    def detect(self, frame: np.ndarray) -> DetectionResult:
+        now = time.perf_counter()
+        unchanged = self._scene_unchanged(frame)
+        # תוצאה ריקה לא נשמרת, כדי שיד שנכנסת תזוהה מיד
+        if (unchanged and self._last_detection is not None
+                and now - self._last_detection_time < MOTION_GATE_MAX_AGE):
+            return self._last_detection
+
+        mp_image  = mp.Image(image_format=mp.ImageFormat.SRGB, data=self._to_rgb(frame))
+
+        # detect_async דורש timestamps עולים ממש
+        timestamp_ms = int((time.perf_counter() - self._start_time) * 1000)
+        timestamp_ms = max(timestamp_ms, self._last_ts_ms + 1)
+        self._last_ts_ms = timestamp_ms
+        self._landmarker.detect_async(mp_image, timestamp_ms)
+
+        # התוצאה האחרונה שהושלמה (פריים אחד של השהיה)
+        with self._result_lock:
+            detection = self._latest
+
+        if detection.hands:
+            self._last_detection      = detection
+            self._last_detection_time = now
+        else:
+            self._last_detection = None
         return detection
 
     def close(self):
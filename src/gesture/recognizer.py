@@ -1,80 +1,155 @@
 import numpy as np
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .detector import DetectionResult
 
 
+# מזהה מספרי קבוע לכל תנועה — לטבלאות מבוססות מערך
+GESTURE_IDS = {
+    "heart":       0,
+    "thumbs_up":   1,
+    "thumbs_down": 2,
+    "open_palm":   3,
+    "fist":        4,
+    "point":       5,
+    "peace":       6,
+    "rock":        7,
+    "l_shape":     8,
+    "unknown":     9,
+}
+
+# שם לתצוגה לכל תנועה
+GESTURE_LABELS = {
+    "heart":      "לב",
+    "thumbs_up":  "אגודל למעלה",
+    "thumbs_down": "אגודל למטה",
+    "open_palm":  "כף פתוחה",
+    "fist":       "אגרוף",
+    "peace":      "peace",
+    "point":      "מצביע",
+    "rock":       "rock",
+    "unknown":    "",
+}
+
+
 @dataclass
 class RecognizedGesture:
+    # __slots__ ידני (ולא slots=True) כדי לשמור על תמיכה ב-Python 3.9
+    __slots__ = ("name", "handedness", "fingers_up", "label")
+
     name: str          # "heart" | "thumbs_up" | "open_palm" | ...
     handedness: str    # "Left" | "Right"
-    fingers_up: List[bool]   # [thumb, index, middle, ring, pinky]
+    fingers_up: Tuple[bool, ...]   # (thumb, index, middle, ring, pinky)
+    label: str         # GESTURE_LABELS[name], נקבע פעם אחת ביצירה
+
+
+_TIPS = [8, 12, 16, 20]
+_PIPS = [6, 10, 14, 18]
+_VERT_BITS = np.array([8, 4, 2, 1])   # index, middle, ring, pinky
+
+# mask (0-31) → (thumb, index, middle, ring, pinky). tuples — משותפים לכל הפריימים
+_MASK_FINGERS = [tuple(bool(m >> bit & 1) for bit in (4, 3, 2, 1, 0)) for m in range(32)]
 
 
 class GestureRecognizer:
 
-    def _fingers_up(self, landmarks, handedness: str) -> List[bool]:
-        """מחזיר [thumb, index, middle, ring, pinky] — True = אצבע פשוטה."""
-        fingers = []
+    _HEART_THRESH_SQ = 0.065 ** 2
+
+    # mask = thumb index middle ring pinky (ביט עליון = אגודל).
+    # None = תלוי גם במיקום/מרחק, מטופל ב-_classify_mask
+    _MASK_TO_NAME = {
+        0b11111: "open_palm",
+        0b00000: "fist",
+        0b10000: None,      # thumbs_up / thumbs_down
+        0b11000: None,      # heart / l_shape
+        0b01000: "point",
+        0b01100: "peace",   # ✌️
+        0b01001: "rock",    # 🤘
+    }
+
+    def __init__(self, min_frames: int = 3, max_hands: int = 2):
+        # תנועה נפלטת רק אחרי min_frames פריימים רצופים באותה יד
+        self.min_frames = min_frames
+        # מיקום היד ב-detection.hands → (name, count). לא לפי handedness:
+        # MediaPipe לפעמים מסמן את שתי הידיים כ-"Right" (או שתיהן "Left")
+        self._history: Dict[int, Tuple[str, int]] = {}
+        # timestamp של התוצאה האחרונה שנספרה — אותה תוצאה לא מקדמת את הרצף פעמיים
+        self._last_ts_ms: Optional[int] = None
+
+        # אובייקטים ורשימה שממוחזרים בכל פריים — תקפים עד הקריאה הבאה ל-recognize
+        self._pool = [RecognizedGesture("", "", (), "") for _ in range(max_hands)]
+        self._out: List[RecognizedGesture] = []
+
+    def _finger_mask(self, pts: np.ndarray, handedness: str) -> int:
+        """מחזיר mask של thumb index middle ring pinky — ביט דלוק = אצבע פשוטה."""
         # אגודל — ציר אופקי
         if handedness == "Right":
-            fingers.append(landmarks[4].x < landmarks[3].x)
+            thumb = pts[4, 0] < pts[3, 0]
         else:
-            fingers.append(landmarks[4].x > landmarks[3].x)
-        # שאר האצבעות — ציר אנכי
-        for tip, pip in [(8, 6), (12, 10), (16, 14), (20, 18)]:
-            fingers.append(landmarks[tip].y < landmarks[pip].y)
-        return fingers
-
-    def _dist(self, landmarks, a: int, b: int) -> float:
-        pa = np.array([landmarks[a].x, landmarks[a].y])
-        pb = np.array([landmarks[b].x, landmarks[b].y])
-        return float(np.linalg.norm(pa - pb))
-
-    def classify(self, landmarks, handedness: str) -> str:
-        f = self._fingers_up(landmarks, handedness)
-        thumb, index, middle, ring, pinky = f
-        count = sum(f)
-        thumb_index_dist = self._dist(landmarks, 4, 8)
-
-        if count == 5:
-            return "open_palm"
-        if count == 0:
-            return "fist"
-
-        # אגודל בלבד
-        if thumb and not index and not middle and not ring and not pinky:
-            return "thumbs_up" if landmarks[4].y < landmarks[0].y else "thumbs_down"
+            thumb = pts[4, 0] > pts[3, 0]
+        # שאר האצבעות — ציר אנכי, השוואה אחת
+        vert = pts[_TIPS, 1] < pts[_PIPS, 1]
+        return (int(thumb) << 4) | int(vert @ _VERT_BITS)
 
-        # לב: אגודל + אצבע מורה, קצוות קרובים
-        if thumb and index and not middle and not ring and not pinky:
-            if thumb_index_dist < 0.065:
-                return "heart"
-            return "l_shape"
+    def _tip_dist_sq(self, pts: np.ndarray, a: int, b: int) -> float:
+        d = pts[a] - pts[b]
+        return float(d @ d)
 
-        # מצביע
-        if not thumb and index and not middle and not ring and not pinky:
-            return "point"
+    def classify(self, pts: np.ndarray, handedness: str) -> Tuple[str, Tuple[bool, ...]]:
+        mask = self._finger_mask(pts, handedness)
+        return self._classify_mask(pts, mask), _MASK_FINGERS[mask]
 
-        # peace ✌️
-        if not thumb and index and middle and not ring and not pinky:
-            return "peace"
+    def _classify_mask(self, pts: np.ndarray, mask: int) -> str:
+        name = self._MASK_TO_NAME.get(mask, "unknown")
+        if name is not None:
+            return name
 
-        # rock 🤘
-        if not thumb and index and not middle and not ring and pinky:
-            return "rock"
+        # אגודל בלבד — למעלה או למטה
+        if mask == 0b10000:
+            return "thumbs_up" if pts[4, 1] < pts[0, 1] else "thumbs_down"
 
-        return "unknown"
+        # לב: אגודל + אצבע מורה, קצוות קרובים
+        if self._tip_dist_sq(pts, 4, 8) < self._HEART_THRESH_SQ:
+            return "heart"
+        return "l_shape"
+
+    def _stable(self, hand_idx: int, name: str, fresh: bool) -> bool:
+        prev, count = self._history.get(hand_idx, (None, 0))
+        if fresh:
+            count = count + 1 if prev == name else 1
+            self._history[hand_idx] = (name, count)
+        elif prev != name:
+            return False
+        return count >= self.min_frames
 
     def recognize(self, detection: DetectionResult) -> List[RecognizedGesture]:
-        results = []
-        for hand in detection.hands:
-            name    = self.classify(hand.landmarks, hand.handedness)
-            fingers = self._fingers_up(hand.landmarks, hand.handedness)
-            results.append(RecognizedGesture(
-                name=name,
-                handedness=hand.handedness,
-                fingers_up=fingers,
-            ))
+        results = self._out
+        results.clear()
+        if not detection.hands:
+            self._history.clear()
+            return results
+
+        # detect() מחזיר את התוצאה האחרונה שהושלמה — לרוב אותה אחת כמה פריימים
+        # ברצף (LIVE_STREAM, שער התנועה). רק תוצאה חדשה נספרת
+        fresh = detection.timestamp_ms is None or detection.timestamp_ms != self._last_ts_ms
+        self._last_ts_ms = detection.timestamp_ms
+
+        # ה-(N, 21, 2) כבר נבנה ב-callback של הגלאי — כאן רק חיתוך לכל יד
+        for i, (hand, pts) in enumerate(zip(detection.hands, detection.landmarks_xy)):
+            name, fingers = self.classify(pts, hand.handedness)
+            if not self._stable(i, name, fresh):
+                continue
+            if len(results) == len(self._pool):
+                self._pool.append(RecognizedGesture("", "", (), ""))
+            g = self._pool[len(results)]
+            g.name       = name
+            g.handedness = hand.handedness
+            g.fingers_up = fingers
+            g.label      = GESTURE_LABELS.get(name, "")
+            results.append(g)
+
+        # יד שיצאה מהפריים מתחילה מחדש
+        for i in [i for i in self._history if i >= len(detection.hands)]:
+            del self._history[i]
         return results
@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .camera import Camera
+from .gesture.detector import HandDetector
+from .gesture.recognizer import GestureRecognizer, RecognizedGesture
+from .ui.visualizer import Visualizer
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineThread(threading.Thread):
+    """מצלמה → זיהוי → תנועות → ציור, ברקע.
+
+    ה-thread הראשי נשאר רק עם imshow/waitKey — ב-macOS חלונות OpenCV
+    חייבים לרוץ מה-thread הראשי.
+    """
+
+    def __init__(
+        self,
+        camera: Camera,
+        detector: HandDetector,
+        recognizer: GestureRecognizer,
+        visualizer: Visualizer,
+        on_gestures: Callable[[List[RecognizedGesture]], None],
+    ):
+        super().__init__(name="pipeline", daemon=True)
+        self._camera      = camera
+        self._detector    = detector
+        self._recognizer  = recognizer
+        self._visualizer  = visualizer
+        self._on_gestures = on_gestures
+        self._slot: deque = deque(maxlen=1)
+        self._stop_event  = threading.Event()
+
+    def latest(self) -> Optional[np.ndarray]:
+        """הפריים המצויר האחרון שעוד לא הוצג, או None."""
+        try:
+            return self._slot.popleft()
+        except IndexError:
+            return None
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                frame = self._camera.read()
+                # המצלמה לא חוסמת — None עד שמגיע פריים חדש
+                if frame is None:
+                    time.sleep(0.001)
+                    continue
+
+                detection = self._detector.detect(frame)
+                gestures  = self._recognizer.recognize(detection)
+                self._on_gestures(gestures)
+
+                # המצלמה מסרה את הפריים לנו בלבד — מציירים ישירות עליו
+                self._slot.append(
+                    self._visualizer.draw(frame, detection, gestures, inplace=True))
+        except Exception:
+            logger.exception("Pipeline thread failed")
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(timeout=1.0)
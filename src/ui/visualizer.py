@@ -1,6 +1,6 @@
 import time
 import os
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 
 import cv2
 import numpy as np
@@ -17,18 +17,7 @@ _EMOJI_FONT_CANDIDATES = [
 ]
 
 EMOJI_DISPLAY_SECS = 2.0
-
-GESTURE_LABELS = {
-    "heart":      "לב",
-    "thumbs_up":  "אגודל למעלה",
-    "thumbs_down": "אגודל למטה",
-    "open_palm":  "כף פתוחה",
-    "fist":       "אגרוף",
-    "peace":      "peace",
-    "point":      "מצביע",
-    "rock":       "rock",
-    "unknown":    "",
-}
+EMOJI_SIZE = 200
 
 
 def _load_emoji_font(size: int):
@@ -44,24 +33,52 @@ def _load_emoji_font(size: int):
 class Visualizer:
 
     def __init__(self):
-        self._emoji_font = _load_emoji_font(size=109)
+        # הגופן נטען רק באימוגי הראשון שמוצג
+        self._emoji_font = None
+        self._emoji_font_tried = False
 
         self._active_emoji: Optional[str] = None
         self._emoji_start:  float = 0.0
+        # אימוגי → (BGR, alpha 0-1 float32) מרונדרים פעם אחת, בגודל EMOJI_SIZE x EMOJI_SIZE
+        self._emoji_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # משקלי המיזוג — באפרים קבועים
+        self._emoji_w1 = np.empty((EMOJI_SIZE, EMOJI_SIZE), dtype=np.float32)
+        self._emoji_w2 = np.empty((EMOJI_SIZE, EMOJI_SIZE), dtype=np.float32)
+
+        # זוגות האינדקסים של עצמות היד, לציור ב-polylines
+        self._conn_idx = np.array(HAND_CONNECTIONS, dtype=np.int32)
 
     # ------------------------------------------------------------------ #
 
     def show_emoji(self, emoji: str):
         self._active_emoji = emoji
-        self._emoji_start  = time.time()
+        self._emoji_start  = time.monotonic()
+        if emoji not in self._emoji_cache and self._ensure_font():
+            self._emoji_cache[emoji] = self._render_emoji(emoji)
+
+    def _ensure_font(self) -> bool:
+        if not self._emoji_font_tried:
+            self._emoji_font = _load_emoji_font(size=109)
+            self._emoji_font_tried = True
+        return self._emoji_font is not None
+
+    def _render_emoji(self, emoji: str) -> Tuple[np.ndarray, np.ndarray]:
+        layer = Image.new("RGBA", (EMOJI_SIZE, EMOJI_SIZE), (0, 0, 0, 0))
+        draw  = ImageDraw.Draw(layer)
+        draw.text((0, 0), emoji, font=self._emoji_font, embedded_color=True)
+        rgba = np.array(layer)
+        # RGB→BGR פעם אחת, כדי למזג ישירות לתוך הפריים
+        return rgba[..., 2::-1].copy(), rgba[..., 3].astype(np.float32) / 255.0
 
     def draw(
         self,
         frame: np.ndarray,
         detection: DetectionResult,
         gestures: List[RecognizedGesture],
+        inplace: bool = False,
     ) -> np.ndarray:
-        display = frame.copy()
+        # inplace=True חוסך העתקה מלאה של הפריים כשהקורא כבר לא צריך את המקור
+        display = frame if inplace else frame.copy()
 
         # ציור נקודות ועצמות יד
         self._draw_landmarks(display, detection)
@@ -81,25 +98,21 @@ class Visualizer:
     # ------------------------------------------------------------------ #
 
     def _draw_landmarks(self, frame: np.ndarray, detection: DetectionResult):
+        if not detection.hands:
+            return
         h, w = frame.shape[:2]
-        for hand in detection.hands:
-            lm = hand.landmarks
-
-            # חיבורים
-            for a, b in HAND_CONNECTIONS:
-                x1, y1 = int(lm[a].x * w), int(lm[a].y * h)
-                x2, y2 = int(lm[b].x * w), int(lm[b].y * h)
-                cv2.line(frame, (x1, y1), (x2, y2), (0, 200, 255), 2)
+        for pts in detection.landmarks_px(w, h):
+            # חיבורים — קריאה אחת ל-polylines עם כל הקטעים
+            cv2.polylines(frame, list(pts[self._conn_idx]), False, (0, 200, 255), 2)
 
             # נקודות
-            for pt in lm:
-                cx, cy = int(pt.x * w), int(pt.y * h)
+            for cx, cy in pts.tolist():
                 cv2.circle(frame, (cx, cy), 5, (255, 255, 255), -1)
                 cv2.circle(frame, (cx, cy), 5, (0, 150, 255), 1)
 
     def _draw_gesture_label(self, frame: np.ndarray, gestures: List[RecognizedGesture]):
         for g in gestures:
-            label = GESTURE_LABELS.get(g.name, "")
+            label = g.label
             if label:
                 cv2.putText(frame, label, (10, 38),
                             cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 220, 220), 2)
@@ -109,31 +122,32 @@ class Visualizer:
         if not self._active_emoji:
             return
 
-        elapsed = time.time() - self._emoji_start
+        elapsed = time.monotonic() - self._emoji_start
         if elapsed > EMOJI_DISPLAY_SECS:
             self._active_emoji = None
             return
 
         alpha = max(0.0, 1.0 - elapsed / EMOJI_DISPLAY_SECS)
         h, w = frame.shape[:2]
-        size = 200
-
-        if self._emoji_font:
-            # PIL — אימוגי צבעוני אמיתי
-            layer = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-            draw  = ImageDraw.Draw(layer)
-            draw.text((0, 0), self._active_emoji, font=self._emoji_font,
-                      embedded_color=True)
-            r, g, b, a = layer.split()
-            a = a.point(lambda v: int(v * alpha))
-            layer = Image.merge("RGBA", (r, g, b, a))
-
-            pil_frame = Image.fromarray(
-                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            ).convert("RGBA")
-            pil_frame.paste(layer, ((w - size) // 2, (h - size) // 2), layer)
-            frame[:] = cv2.cvtColor(np.array(pil_frame.convert("RGB")),
-                                    cv2.COLOR_RGB2BGR)
+        size = EMOJI_SIZE
+
+        cached = self._emoji_cache.get(self._active_emoji)
+        if cached is not None:
+            # מיזוג alpha ישירות לתוך ה-ROI של הפריים (BGR), בלי PIL בכל פריים.
+            # blendLinear עושה את כל החישוב בלולאה אחת ב-C, בלי מערכי ביניים
+            bgr, a_full = cached
+            ex, ey = (w - size) // 2, (h - size) // 2
+            # חיתוך לגבולות הפריים — פריים קטן מ-EMOJI_SIZE נותן ex/ey שליליים
+            x0, y0 = max(ex, 0), max(ey, 0)
+            x1, y1 = min(ex + size, w), min(ey + size, h)
+            if x0 >= x1 or y0 >= y1:
+                return
+            src = (slice(y0 - ey, y1 - ey), slice(x0 - ex, x1 - ex))
+            roi = frame[y0:y1, x0:x1]
+            w1, w2 = self._emoji_w1[src], self._emoji_w2[src]
+            np.multiply(a_full[src], alpha, out=w1)
+            np.subtract(1.0, w1, out=w2)
+            roi[:] = cv2.blendLinear(bgr[src], roi, w1, w2)
         else:
             # Fallback — טקסט רגיל
             c = int(255 * alpha)